@@ -1,4 +1,4 @@
-from exc import SqlAlchemyRepositoryQueryingException
+from src.exc import SqlAlchemyRepositoryQueryingException
 from src.database import SqlAlchemyDb
 from src.repositories import (
     BaseRepository, ListRepository, RetrieveRepository, AddOneRepository, AddManyRepository, UpdateRepository,
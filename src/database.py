@@ -6,14 +6,22 @@ It provides access to all the needed parts of a SQLAlchemy connection:
 - SQLAlchemy engine
 - The SQLAlchemy MetaData
 - The SQLAlchemy SessionMaker
+- A thread-local scoped session registry
+- Units of work, sharing a single session and transaction across repository calls
 """
 
 from contextlib import contextmanager
-from typing import Any
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator
 
 from sqlalchemy import MetaData, create_engine
-from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker, session
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.orm import Session, declarative_base, scoped_session, sessionmaker, session
+from sqlalchemy.pool import QueuePool
+
+_QUEUE_POOL_SIZE: int = 20
+_QUEUE_POOL_MAX_OVERFLOW: int = 10
+_unit_of_work_sessions: ContextVar[Dict["SqlAlchemyDb", Session]] = ContextVar("unit_of_work_sessions", default={})
 
 
 class SqlAlchemyDb:
@@ -25,17 +33,63 @@ class SqlAlchemyDb:
     - SQLAlchemy engine
     - The SQLAlchemy MetaData
     - The SQLAlchemy SessionMaker
+    - A thread-local scoped session registry
+    - Units of work, sharing a single session and transaction across repository calls
     """
-    _connection_url: str
+    _connection_url: str | URL
     _Base: Any
     _engine: Engine
     _MetaData: Any
     _SessionMaker: sessionmaker
+    _ScopedSession: scoped_session
+
+    def __init__(
+            self,
+            connection_url: str | URL,
+            schema: str = "public",
+            pool_size: int | None = None,
+            max_overflow: int | None = None,
+            pool_timeout: float | None = None,
+            pool_recycle: int | None = 1800,
+            pool_pre_ping: bool | None = True,
+            query_cache_size: int = 2048
+    ):
+        """
+        Pool options left as None are not sent to the engine, which keeps its defaults. Not every pool class accepts
+        every option: 'pool_size', 'max_overflow' and 'pool_timeout' only apply to a QueuePool. When the URL resolves
+        to a QueuePool, 'pool_size' and 'max_overflow' default to 20 and 10.
 
-    def __init__(self, connection_url, schema: str = "public"):
+        :param connection_url: The database's connection URL, either as a string or as a URL object. Prefer building
+        it with 'URL.create', which escapes every component and spares the engine from parsing it. For PostgreSQL,
+        the 'postgresql+psycopg' (psycopg 3) driver is recommended over 'postgresql+psycopg2'.
+        :param schema: The schema the declarative base's metadata is bound to.
+        :param pool_size: The number of connections to keep open inside the connection pool.
+        :param max_overflow: The number of connections allowed to be opened beyond 'pool_size' under load.
+        :param pool_timeout: Seconds to wait for a connection to become available before giving up.
+        :param pool_recycle: Seconds after which a pooled connection is recycled. Avoids using connections closed by
+        the server's idle timeout.
+        :param pool_pre_ping: Whether to test pooled connections for liveness upon checkout.
+        :param query_cache_size: The size of the engine's compiled statements cache. Set it to 0 to disable caching.
+        """
         self._connection_url = connection_url
-        self._engine = create_engine(url=self._connection_url)
-        self._SessionMaker = sessionmaker(bind=self._engine)
+        url = make_url(connection_url)
+        if issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+            pool_size = _QUEUE_POOL_SIZE if pool_size is None else pool_size
+            max_overflow = _QUEUE_POOL_MAX_OVERFLOW if max_overflow is None else max_overflow
+        pool_options: Dict[str, Any] = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping
+        }
+        self._engine = create_engine(
+            url=self._connection_url,
+            query_cache_size=query_cache_size,
+            **{option: value for option, value in pool_options.items() if value is not None}
+        )
+        self._SessionMaker = sessionmaker(bind=self._engine, class_=Session, expire_on_commit=False, autoflush=False)
+        self._ScopedSession = scoped_session(self._SessionMaker)
         self._Base = declarative_base(metadata=MetaData(schema=schema))
         self._MetaData = self._Base.metadata
 
@@ -71,3 +125,60 @@ class SqlAlchemyDb:
             yield db_session
         finally:
             db_session.close()
+
+    def get_scoped_session(self) -> scoped_session:
+        """
+        Returns the thread-local scoped session registry. Calling it returns the session bound to the current thread.
+        This registry is kept apart from units of work: repositories never pick its session up implicitly, since a
+        thread-bound session outlives any single block and would leave the transaction's boundaries to whoever
+        remembers to remove it. Pass its session explicitly to repository calls to use it.
+
+        :return: The scoped session registry.
+        """
+        return self._ScopedSession
+
+    def get_current_session(self) -> Session | None:
+        """
+        Returns the session of the unit of work running in the current context, if any. Sessions obtained through
+        'get_scoped_session' are not considered part of a unit of work.
+
+        :return: The unit of work's session, or None if no unit of work is running.
+        """
+        return _unit_of_work_sessions.get().get(self)
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[Session]:
+        """
+        Runs a unit of work in a single session and transaction, committed when the block exits or rolled back if it
+        raises. Repository calls made inside the block, without an explicit session, reuse this session:
+
+            with db.unit_of_work() as session:
+                item = repository.retrieve(pk)
+                repository.update_one(pk, update_values)
+
+        A unit of work started inside another one joins it: it yields the outer session and leaves committing or
+        rolling back to the outermost block.
+
+        Sessions are created with autoflush disabled, so pending changes are only sent to the database by repository
+        writes, which flush, or by an explicit 'session.flush()'. Until then, queries such as 'retrieve_row',
+        'list_all_rows' and 'list_paged' run against the stored data and miss changes made in memory.
+
+        :return: The unit of work's session.
+        """
+        current_session = self.get_current_session()
+        if current_session is not None:
+            yield current_session
+            return
+
+        db_session: Session = self._SessionMaker()
+        token = _unit_of_work_sessions.set({**_unit_of_work_sessions.get(), self: db_session})
+        try:
+            yield db_session
+            db_session.commit()
+        except Exception:
+            db_session.rollback()
+            raise
+        finally:
+            _unit_of_work_sessions.reset(token)
+            db_session.close()
+
@@ -4,146 +4,351 @@ classes to use its functionalities.
 """
 
 from abc import ABC
-from functools import partial
-from typing import Any, Collection, Dict, List
+from itertools import islice
+from typing import Any, Collection, Dict, Iterable, Iterator, List, Tuple
 
+from sqlalchemy import Column, Row, RowMapping, delete, insert, select, update
 from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import DeclarativeBase, Session
 
 from src.database import SqlAlchemyDb
 from src.exc import SqlAlchemyRepositoryQueryingException
 
+_INSERT_BATCH_SIZE: int = 1000
+
 
 class BaseRepository(ABC):
     """Base repository from which all repositories inherit from."""
     _model: DeclarativeBase
     _database: SqlAlchemyDb
+    _pk_col: Column
+    _pk_name: str
+    _tablename: str
+    _insert_cols: Tuple[str, ...]
+    _relationship_keys: Tuple[str, ...]
 
     def __init__(self, model: DeclarativeBase, database: SqlAlchemyDb):
         self._model = model
         self._database = database
+        mapper = inspect(model)
+        self._pk_col = mapper.primary_key[0]
+        self._pk_name = self._pk_col.name
+        self._tablename = model.__tablename__
+        self._insert_cols = tuple(attr.key for attr in mapper.column_attrs)
+        self._relationship_keys = tuple(mapper.relationships.keys())
 
     def get_database(self) -> SqlAlchemyDb:
         """Returns a reference to the repository's database instance."""
         return self._database
 
+    def _get_session(self, session: Session | None) -> Session | None:
+        """Returns the given session or, if none is given, the session of the database's running unit of work."""
+        if session is None:
+            return self._database.get_current_session()
+        return session
+
+    def _get_one(self, pk: Any, session: Session) -> Any:
+        """Returns the object with the given primary key, raising if it doesn't exist."""
+        item = session.get(self._model, pk)
+        if item is None:
+            raise SqlAlchemyRepositoryQueryingException(f"No object with primary key {pk}, exists on table "
+                                                        f"{self._tablename}")
+        return item
 
-class RetrieveRepository(ABC, BaseRepository):
+
+class RetrieveRepository(BaseRepository):
     """Defines a 'retrieve' method, which queries an object based on its primary key."""
 
     def retrieve(self, pk: Any, session: Session | None = None) -> Any:
         """
-        Queries and returns an object based on its primary key.
+        Queries and returns an object based on its primary key. Objects already loaded by the session, for instance
+        earlier in the same unit of work, are returned from its identity map without querying the database.
 
         :param pk: The object's primary key identifier.
-        :param session: An open database session. If none is given, one will be created and destroyed for this
-        operation.
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed for this operation.
         :return: The object.
         """
-        func = partial(self._retrieve, pk=pk)
+        session = self._get_session(session)
         if session is None:
             with self.get_database().get_database_session() as session:
-                return func(session=session)
+                return self._retrieve(pk, session)
 
-        return func(session)
+        return self._retrieve(pk, session)
 
     def _retrieve(self, pk: Any, session: Session) -> Any:
         """Queries and returns an object based on its primary key."""
-        item = session.query(self._model).get(pk)
-        if item is None:
+        return self._get_one(pk, session)
+
+    def retrieve_row(
+            self,
+            pk: Any,
+            session: Session | None = None,
+            *,
+            as_mapping: bool = False
+    ) -> Row | RowMapping:
+        """
+        Queries and returns a table row based on its primary key. Unlike 'retrieve', no ORM object is built nor added
+        to the session, which makes it cheaper for read-only uses.
+
+        :param pk: The row's primary key identifier.
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed for this operation.
+        :param as_mapping: Flag that specifies whether to return the row as a dictionary-like mapping or not.
+        :return: The row.
+        """
+        session = self._get_session(session)
+        if session is None:
+            with self.get_database().get_database_session() as session:
+                return self._retrieve_row(pk, as_mapping, session)
+
+        return self._retrieve_row(pk, as_mapping, session)
+
+    def _retrieve_row(self, pk: Any, as_mapping: bool, session: Session) -> Row | RowMapping:
+        """Queries and returns a table row based on its primary key."""
+        result = session.execute(select(*self._model.__table__.c).where(self._pk_col == pk))
+        row = (result.mappings() if as_mapping else result).one_or_none()
+        if row is None:
             raise SqlAlchemyRepositoryQueryingException(f"No object with primary key {pk}, exists on table "
-                                                        f"{self._model.__tablename__}")
-        return item
+                                                        f"{self._tablename}")
+        return row
 
 
-class ListRepository(ABC, BaseRepository):
+class ListRepository(BaseRepository):
     """Defines a 'list_all' method, which queries all objects of the repository's model."""
 
     def list_all(self, session: Session | None = None) -> List[Any]:
         """
         Queries and returns all objects.
 
-        :param session: An open database session. If none is given, one will be created and destroyed for this
-        operation.
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed for this operation.
         :return: The list of objects.
         """
+        session = self._get_session(session)
+        if session is None:
+            with self.get_database().get_database_session() as session:
+                return self._list_all(self._model, session)
+
+        return self._list_all(self._model, session)
+
+    def list_all_rows(
+            self,
+            session: Session | None = None,
+            *,
+            as_mapping: bool = False
+    ) -> List[Row | RowMapping]:
+        """
+        Queries and returns all table rows. Unlike 'list_all', no ORM objects are built nor added to the session, which
+        makes it cheaper for read-only uses over large tables.
+
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed for this operation.
+        :param as_mapping: Flag that specifies whether to return the rows as dictionary-like mappings or not.
+        :return: The list of rows.
+        """
+        session = self._get_session(session)
+        if session is None:
+            with self.get_database().get_database_session() as session:
+                return self._list_all_rows(as_mapping, session)
+
+        return self._list_all_rows(as_mapping, session)
+
+    def _list_all_rows(self, as_mapping: bool, session: Session) -> List[Row | RowMapping]:
+        """Queries and returns all table rows."""
+        result = session.execute(select(*self._model.__table__.c).execution_options(stream_results=True))
+        return (result.mappings() if as_mapping else result).all()
+
+    @staticmethod
+    def _list_all(model: DeclarativeBase, session: Session) -> List[Any]:
+        """Queries and returns all objects, streaming rows from a server-side cursor where the driver supports it."""
+        return session.scalars(select(model).execution_options(stream_results=True)).all()
+
+    def list_paged(self, offset: int, limit: int, session: Session | None = None) -> List[Any]:
+        """
+        Queries and returns a page of objects, ordered by their primary key.
+
+        :param offset: The number of objects to skip.
+        :param limit: The maximum number of objects to return.
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed for this operation.
+        :return: The list of objects.
+        """
+        session = self._get_session(session)
+        if session is None:
+            with self.get_database().get_database_session() as session:
+                return self._list_paged(offset, limit, session)
+
+        return self._list_paged(offset, limit, session)
+
+    def _list_paged(self, offset: int, limit: int, session: Session) -> List[Any]:
+        """Queries and returns a page of objects, ordered by their primary key."""
+        statement = select(self._model).order_by(self._pk_col).offset(offset).limit(limit)
+        return session.scalars(statement).all()
+
+    def iter_all(self, session: Session | None = None, *, batch_size: int = 1000) -> Iterator[Any]:
+        """
+        Iterates over all objects, fetching them from the database in batches. Unlike 'list_all', only one batch of
+        objects is held in memory at a time.
+
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed once the iteration ends.
+        :param batch_size: The number of objects fetched per batch.
+        :return: An iterator over the objects.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+
+        return self._iter_all(batch_size, self._get_session(session))
+
+    def _iter_all(self, batch_size: int, session: Session | None) -> Iterator[Any]:
+        """Iterates over all objects, fetching them from the database in batches."""
         if session is None:
             with self.get_database().get_database_session() as session:
-                return session.query(self._model).all()
+                yield from self._iter_all(batch_size, session)
+            return
 
-        return self._list_all(session)
+        yield from session.scalars(select(self._model).execution_options(yield_per=batch_size))
 
 
-class AddOneRepository(ABC, BaseRepository):
+class AddOneRepository(BaseRepository):
     """Defines an 'add_one' method, which inserts an object."""
 
     def add_one(self, obj: Any, session: Session | None = None) -> Any:
         """
-        Adds, saves and refreshes a single object.
+        Adds and saves a single object. Only its primary key is populated by the database, other server-generated
+        values are not loaded.
 
         :param obj: The object to save in the database.
-        :param session: An open database session. If none is given, one will be created and destroyed for this
-        operation.
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed for this operation. Changes made on a given or unit of work session are
+        flushed but not committed, leaving the transaction to its owner.
         :return: The saved object.
         """
-        func = partial(self._add_one, obj=obj)
+        session = self._get_session(session)
         if session is None:
             with self.get_database().get_database_session() as session:
-                return func(session)
+                return self._add_one_managed(obj, session)
 
-        return func(session)
+        return self._add_one_attached(obj, session)
 
     @staticmethod
-    def _add_one(obj: Any, session: Session) -> Any:
-        """Adds, saves and refreshes a single object."""
+    def _add_one_managed(obj: Any, session: Session) -> Any:
+        """Adds and saves a single object, committing the session's transaction."""
         session.add(obj)
         session.commit()
-        session.refresh(obj)
+        return obj
+
+    @staticmethod
+    def _add_one_attached(obj: Any, session: Session) -> Any:
+        """Adds and flushes a single object, without committing the session's transaction."""
+        session.add(obj)
+        session.flush()
         return obj
 
 
-class AddManyRepository(ABC, BaseRepository):
+class AddManyRepository(BaseRepository):
     """Defines an 'add_many' method, which inserts multiple objects."""
 
     def add_many(
             self,
-            objects: Collection[Any],
+            objects: Iterable[Any],
             with_return: bool = False,
-            session: Session | None = None
+            session: Session | None = None,
+            *,
+            batch_size: int = _INSERT_BATCH_SIZE
     ) -> Collection[Any] | None:
         """
         Adds and saves multiple objects.
 
-        :param objects: The object to save in the database.
-        :param with_return: Flag that specifies whether to refresh the collection of objects and return them or not.
-        Keep in mind that refreshing a large list of objects might have performance implications.
-        :param session: An open database session. If none is given, one will be created and destroyed for this
-        operation.
+        :param objects: The objects to save in the database. Any iterable is accepted, including generators.
+        :param with_return: Flag that specifies whether to fetch the saved objects and return them or not. The given
+        objects are inserted in bulk and are not added to the session, so the returned objects are new instances, unless
+        they have related objects assigned, in which case they are added to the session and returned themselves.
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed for this operation. Changes made on a given or unit of work session are
+        flushed but not committed, leaving the transaction to its owner.
+        :param batch_size: The maximum number of rows sent per INSERT statement. All batches share one transaction.
+        The default suits PostgreSQL; other databases, such as MySQL, may perform better with larger batches.
         :return: None if the 'with_return' parameter is False (default). A list with the saved objects otherwise.
         """
-        func = partial(self._add_many, objects=objects, with_return=with_return)
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be a positive integer, got {batch_size}")
+
+        objects = list(objects)
+        session = self._get_session(session)
         if session is None:
             with self.get_database().get_database_session() as session:
-                return func(session=session)
+                return self._add_many_managed(objects, with_return, batch_size, session)
 
-        return func(session=session)
+        return self._add_many_attached(objects, with_return, batch_size, session)
 
-    @staticmethod
-    def _add_many(objects: Collection[Any], with_return: bool, session: Session) -> Collection[Any] | None:
-        """
-        Adds and saves multiple objects. If the 'with_return' parameter is True, the saved objects will be refreshed
-        and returned.
-        """
-        session.add_all(objects)
+    def _add_many_managed(
+            self,
+            objects: Collection[Any],
+            with_return: bool,
+            batch_size: int,
+            session: Session
+    ) -> Collection[Any] | None:
+        """Adds and saves multiple objects, committing the session's transaction."""
+        inserted = self._insert_many(objects, with_return, batch_size, session)
         session.commit()
         if with_return:
-            for obj in objects:
-                session.refresh(obj)
+            return inserted
 
-            return objects
+    def _add_many_attached(
+            self,
+            objects: Collection[Any],
+            with_return: bool,
+            batch_size: int,
+            session: Session
+    ) -> Collection[Any] | None:
+        """Adds multiple objects, without committing the session's transaction."""
+        inserted = self._insert_many(objects, with_return, batch_size, session)
+        if with_return:
+            return inserted
+
+    def _insert_many(
+            self,
+            objects: Collection[Any],
+            with_return: bool,
+            batch_size: int,
+            session: Session
+    ) -> List[Any]:
+        """
+        Inserts multiple objects using bulk INSERT statements of up to 'batch_size' rows each. If the 'with_return'
+        parameter is True, the inserted objects are built from the statements' RETURNING rows and returned in the order
+        they were given.
+
+        Bulk INSERT statements only carry column values, so objects with related objects assigned are added through
+        the session instead, letting foreign keys and cascades be resolved by the unit of work. The same applies when
+        returning objects on a database without multi-row INSERT ... RETURNING support.
+        """
+        if any(obj.__dict__.get(key) for obj in objects for key in self._relationship_keys):
+            return self._add_all(objects, with_return, session)
+        if with_return and not session.get_bind().dialect.insert_executemany_returning:
+            return self._add_all(objects, with_return, session)
+
+        rows = ({key: obj.__dict__[key] for key in self._insert_cols if key in obj.__dict__} for obj in objects)
+        inserted: List[Any] = []
+        while batch := list(islice(rows, batch_size)):
+            if with_return:
+                statement = insert(self._model).returning(self._model, sort_by_parameter_order=True)
+                inserted.extend(session.scalars(statement, batch))
+            else:
+                session.execute(insert(self._model), batch)
+
+        return inserted
+
+    @staticmethod
+    def _add_all(objects: Collection[Any], with_return: bool, session: Session) -> List[Any]:
+        """Adds and flushes multiple objects through the session's unit of work."""
+        session.add_all(objects)
+        session.flush()
+        return list(objects) if with_return else []
 
 
-class DeleteOneRepository(ABC, BaseRepository):
+class DeleteOneRepository(BaseRepository):
     """Defines a 'delete_one' method, which deletes an object based on its primary key."""
 
     def delete_one(self, pk: Any, session: Session | None = None) -> None:
@@ -151,57 +356,104 @@ class DeleteOneRepository(ABC, BaseRepository):
         Deletes a single object based on its primary key.
 
         :param pk: The object's primary key identifier.
-        :param session: An open database session. If none is given, one will be created and destroyed for this
-        operation.
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed for this operation. Changes made on a given or unit of work session are
+        flushed but not committed, leaving the transaction to its owner.
         :return: None.
         """
-        func = partial(self._delete_one, pk=pk)
+        session = self._get_session(session)
         if session is None:
             with self.get_database().get_database_session() as session:
-                func(session=session)
+                return self._delete_one_managed(pk, session)
 
-        func(session=session)
+        return self._delete_one_attached(pk, session)
 
-    def _delete_one(self, pk: Any, session: Session) -> None:
-        """Deletes a single object based on its primary key."""
-        session.query(self._model).get(pk=pk).delete()
+    def _delete_one_managed(self, pk: Any, session: Session) -> None:
+        """Deletes a single object based on its primary key, committing the session's transaction."""
+        self._delete_one_attached(pk, session)
         session.commit()
 
+    def _delete_one_attached(self, pk: Any, session: Session) -> None:
+        """Deletes a single object based on its primary key, without committing the session's transaction."""
+        result = session.execute(delete(self._model).where(self._pk_col == pk))
+        if result.rowcount == 0:
+            raise SqlAlchemyRepositoryQueryingException(f"No object with primary key {pk}, exists on table "
+                                                        f"{self._tablename}")
+
 
-class UpdateRepository(ABC, BaseRepository):
+class UpdateRepository(BaseRepository):
     """
     Defines an 'update_one' method, which updates an object based on a given dictionary of update values, and the
     object's primary key identifier.
     """
 
-    def update_one(self, pk: Any, update_values: Dict, session: Session | None = None) -> Any:
+    def update_one(
+            self,
+            pk: Any,
+            update_values: Dict,
+            session: Session | None = None,
+            *,
+            with_return: bool = True
+    ) -> Any:
         """
         Updates a single object based on its primary key and a dictionary of update values.
 
         :param pk: The object's primary key identifier.
         :param update_values: A dictionary with update values. This method assumes the table only has one primary key,
         and, if passed in the update values parameter, it will be ignored.
-        :param session: An open database session. If none is given, one will be created and destroyed for this
-        operation.
-        :return:
+        :param session: An open database session. If none is given, the running unit of work's session is used, or
+        one will be created and destroyed for this operation. Changes made on a given or unit of work session are
+        flushed but not committed, leaving the transaction to its owner.
+        :param with_return: Flag that specifies whether to return the updated object or not. When returning it on a
+        database that supports UPDATE ... RETURNING, or when not returning it, a single UPDATE statement is issued.
+        Otherwise, the object is loaded and updated through the session. If no values are left to update, the object
+        is returned unchanged.
+        :return: The updated object if the 'with_return' parameter is True (default). None otherwise.
         """
-        func = partial(self._update_one, pk=pk, update_values=update_values)
+        session = self._get_session(session)
         if session is None:
             with self.get_database().get_database_session() as session:
-                return func(session=session)
+                return self._update_one_managed(pk, update_values, with_return, session)
 
-        return func(session=session)
+        return self._update_one_attached(pk, update_values, with_return, session)
 
-    def _update_one(self, pk: Any, update_values: Dict, session: Session) -> Any:
-        """Updates a single object based on its primary key and a dictionary of update values."""
-        item: Any = session.query(self._model).get(pk)
-        pk_field_name: str = inspect(self._model).primary_key[0].name
-        if pk_field_name in update_values:
-            update_values.pop(pk_field_name)
+    def _update_one_managed(self, pk: Any, update_values: Dict, with_return: bool, session: Session) -> Any:
+        """
+        Updates a single object based on its primary key and a dictionary of update values, committing the session's
+        transaction.
+        """
+        item = self._update_one_attached(pk, update_values, with_return, session)
+        session.commit()
+        return item
 
+    def _update_one_attached(self, pk: Any, update_values: Dict, with_return: bool, session: Session) -> Any:
+        """
+        Updates a single object based on its primary key and a dictionary of update values, without committing the
+        session's transaction.
+        """
+        update_values.pop(self._pk_name, None)
+        if not update_values:
+            item = self._get_one(pk, session)
+            return item if with_return else None
+
+        statement = update(self._model).where(self._pk_col == pk).values(**update_values)
+        if not with_return:
+            result = session.execute(statement)
+            if result.rowcount == 0:
+                raise SqlAlchemyRepositoryQueryingException(f"No object with primary key {pk}, exists on table "
+                                                            f"{self._tablename}")
+            return None
+
+        if session.get_bind().dialect.update_returning:
+            item: Any = session.scalars(statement.returning(self._model)).one_or_none()
+            if item is None:
+                raise SqlAlchemyRepositoryQueryingException(f"No object with primary key {pk}, exists on table "
+                                                            f"{self._tablename}")
+            return item
+
+        item = self._get_one(pk, session)
         for field, value in update_values.items():
             setattr(item, field, value)
 
-        session.commit()
-        session.refresh(item)
+        session.flush()
         return item
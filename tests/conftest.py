@@ -0,0 +1,92 @@
+"""Shared fixtures: a file-backed SQLite database with a few models and a repository exposing every operation."""
+
+from typing import Any, List, Optional
+
+import pytest
+from sqlalchemy import ForeignKey, String, event
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.database import SqlAlchemyDb
+from src.repositories import (
+    AddManyRepository, AddOneRepository, DeleteOneRepository, ListRepository, RetrieveRepository, UpdateRepository
+)
+
+
+class FullRepository(
+    RetrieveRepository, ListRepository, AddOneRepository, AddManyRepository, UpdateRepository, DeleteOneRepository
+):
+    """Repository exposing every operation."""
+
+
+class Models:
+    """Namespace for the models declared on a test database."""
+    Item: Any
+    Parent: Any
+    Child: Any
+
+
+@pytest.fixture
+def db(tmp_path) -> SqlAlchemyDb:
+    database = SqlAlchemyDb(f"sqlite:///{tmp_path / 'test.db'}", schema=None)
+    yield database
+    database._engine.dispose()
+
+
+@pytest.fixture
+def models(db: SqlAlchemyDb) -> Models:
+    Base = db.get_base()
+
+    class Item(Base):
+        __tablename__ = "item"
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str] = mapped_column(String(50))
+
+    class Parent(Base):
+        __tablename__ = "parent"
+        id: Mapped[int] = mapped_column(primary_key=True)
+        name: Mapped[str] = mapped_column(String(50))
+        children: Mapped[List["Child"]] = relationship(back_populates="parent")
+
+    class Child(Base):
+        __tablename__ = "child"
+        id: Mapped[int] = mapped_column(primary_key=True)
+        parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey("parent.id"))
+        parent: Mapped[Optional[Parent]] = relationship(back_populates="children")
+
+    db.create_tables()
+    namespace = Models()
+    namespace.Item, namespace.Parent, namespace.Child = Item, Parent, Child
+    return namespace
+
+
+@pytest.fixture
+def items(db: SqlAlchemyDb, models: Models) -> FullRepository:
+    return FullRepository(models.Item, db)
+
+
+@pytest.fixture
+def children(db: SqlAlchemyDb, models: Models) -> FullRepository:
+    return FullRepository(models.Child, db)
+
+
+@pytest.fixture
+def statements(db: SqlAlchemyDb) -> List[str]:
+    """Records the SQL statements sent through the database's engine."""
+    executed: List[str] = []
+    event.listen(db._engine, "before_cursor_execute", lambda conn, cursor, statement, *args: executed.append(statement))
+    return executed
+
+
+def persist(db: SqlAlchemyDb, obj: Any) -> Any:
+    """Saves an object through a fresh session, returning it loaded."""
+    with db.get_database_session() as session:
+        session.add(obj)
+        session.commit()
+        session.refresh(obj)
+        return obj
+
+
+def stored_names(db: SqlAlchemyDb, model: Any) -> List[str]:
+    """Returns the names persisted for the given model, read through a fresh session."""
+    with db.get_database_session() as session:
+        return sorted(obj.name for obj in session.query(model).all())
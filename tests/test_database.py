@@ -0,0 +1,110 @@
+import pytest
+from sqlalchemy.engine import URL
+from sqlalchemy.pool import SingletonThreadPool
+
+from src.database import SqlAlchemyDb
+from tests.conftest import persist, stored_names
+
+
+def test_forwards_pool_options(tmp_path):
+    database = SqlAlchemyDb(f"sqlite:///{tmp_path / 'pool.db'}", schema=None, pool_size=3, max_overflow=2)
+    assert database._engine.pool.size() == 3
+    assert database._engine.pool._max_overflow == 2
+    database._engine.dispose()
+
+
+def test_sets_query_cache_size(tmp_path):
+    database = SqlAlchemyDb(f"sqlite:///{tmp_path / 'cache.db'}", schema=None, query_cache_size=10)
+    assert database._engine._compiled_cache.capacity == 10
+    database._engine.dispose()
+
+
+def test_unit_of_work_commits(db, models, items):
+    with db.unit_of_work():
+        items.add_many([models.Item(name="a"), models.Item(name="b")])
+
+    assert stored_names(db, models.Item) == ["a", "b"]
+
+
+def test_unit_of_work_is_shared_by_repositories(db, models, items):
+    item = persist(db, models.Item(name="a"))
+    with db.unit_of_work() as session:
+        assert db.get_current_session() is session
+        assert items.update_one(item.id, {"name": "b"}) in session
+    assert db.get_current_session() is None
+
+
+def test_accepts_url_object(tmp_path):
+    database = SqlAlchemyDb(URL.create("sqlite", database=str(tmp_path / "url.db")), schema=None)
+    assert database._engine.url.database == str(tmp_path / "url.db")
+    database._engine.dispose()
+
+
+def test_unit_of_work_rolls_back(db, models, items):
+    with pytest.raises(RuntimeError):
+        with db.unit_of_work():
+            items.add_one(models.Item(name="a"))
+            raise RuntimeError
+
+    assert stored_names(db, models.Item) == []
+
+
+def test_builds_engine_without_queue_pool():
+    database = SqlAlchemyDb("sqlite://", schema=None)
+    assert isinstance(database._engine.pool, SingletonThreadPool)
+    assert database._engine.pool._pre_ping is True
+    assert database._engine.pool._recycle == 1800
+    database._engine.dispose()
+
+
+def test_sizes_queue_pool_by_default(tmp_path):
+    database = SqlAlchemyDb(f"sqlite:///{tmp_path / 'pool.db'}", schema=None)
+    assert database._engine.pool.size() == 20
+    assert database._engine.pool._max_overflow == 10
+    assert database._engine.pool._pre_ping is True
+    assert database._engine.pool._recycle == 1800
+    database._engine.dispose()
+
+
+def test_nested_unit_of_work_joins_outer(db, models, items):
+    with pytest.raises(RuntimeError):
+        with db.unit_of_work() as outer:
+            items.add_one(models.Item(name="a"))
+            with db.unit_of_work() as inner:
+                assert inner is outer
+                items.add_one(models.Item(name="b"))
+            raise RuntimeError
+
+    assert stored_names(db, models.Item) == []
+
+
+def test_scoped_session_is_not_a_unit_of_work(db, models, items):
+    db.get_scoped_session()()
+    try:
+        assert db.get_current_session() is None
+        items.add_one(models.Item(name="kept"))
+    finally:
+        db.get_scoped_session().remove()
+
+    assert stored_names(db, models.Item) == ["kept"]
+
+
+def test_units_of_work_are_tracked_per_database(db, tmp_path):
+    other = SqlAlchemyDb(f"sqlite:///{tmp_path / 'other.db'}", schema=None)
+    with db.unit_of_work() as session:
+        assert other.get_current_session() is None
+        with other.unit_of_work() as other_session:
+            assert db.get_current_session() is session
+            assert other.get_current_session() is other_session
+        assert other.get_current_session() is None
+    assert db.get_current_session() is None
+    other._engine.dispose()
+
+
+def test_unit_of_work_does_not_autoflush(db, models, items):
+    item = items.add_one(models.Item(name="a"))
+    with db.unit_of_work() as session:
+        items.retrieve(item.id).name = "b"
+        assert items.retrieve_row(item.id).name == "a"
+        session.flush()
+        assert items.retrieve_row(item.id).name == "b"
@@ -0,0 +1,285 @@
+import pytest
+
+from src.exc import SqlAlchemyRepositoryQueryingException
+from tests.conftest import persist, stored_names
+
+
+def test_add_many_inserts_rows(db, models, items):
+    assert items.add_many([models.Item(name="a"), models.Item(name="b")]) is None
+    assert stored_names(db, models.Item) == ["a", "b"]
+
+
+def test_add_many_returns_saved_objects(models, items):
+    saved = items.add_many([models.Item(name="a"), models.Item(name="b")], with_return=True)
+    assert sorted(item.name for item in saved) == ["a", "b"]
+    assert all(item.id is not None for item in saved)
+
+
+def test_retrieve(db, models, items):
+    item = persist(db, models.Item(name="a"))
+    assert items.retrieve(item.id).name == "a"
+
+
+def test_retrieve_missing_raises(items):
+    with pytest.raises(SqlAlchemyRepositoryQueryingException):
+        items.retrieve(1)
+
+
+def test_delete_one_with_supplied_session(db, models, items):
+    item = persist(db, models.Item(name="a"))
+    with db.get_database_session() as session:
+        items.delete_one(item.id, session)
+        session.commit()
+
+    assert stored_names(db, models.Item) == []
+
+
+def test_delete_one_missing_raises(db, items):
+    with db.get_database_session() as session:
+        with pytest.raises(SqlAlchemyRepositoryQueryingException):
+            items.delete_one(1, session)
+
+
+def test_update_one(db, models, items):
+    item = persist(db, models.Item(name="a"))
+    assert items.update_one(item.id, {"name": "b"}).name == "b"
+    assert stored_names(db, models.Item) == ["b"]
+
+
+def test_update_one_without_return(db, models, items, statements):
+    item = persist(db, models.Item(name="a"))
+    statements.clear()
+    assert items.update_one(item.id, {"name": "b"}, with_return=False) is None
+    assert [statement.split()[0] for statement in statements] == ["UPDATE"]
+    assert stored_names(db, models.Item) == ["b"]
+
+
+def test_update_one_missing_raises(items):
+    with pytest.raises(SqlAlchemyRepositoryQueryingException):
+        items.update_one(1, {"name": "b"})
+    with pytest.raises(SqlAlchemyRepositoryQueryingException):
+        items.update_one(1, {"name": "b"}, with_return=False)
+
+
+def test_update_one_ignores_primary_key(db, models, items):
+    item = persist(db, models.Item(name="a"))
+    assert items.update_one(item.id, {"id": item.id + 1, "name": "b"}).id == item.id
+
+
+def test_list_paged(models, items):
+    items.add_many([models.Item(name=str(i)) for i in range(5)])
+    assert [item.name for item in items.list_paged(1, 2)] == ["1", "2"]
+
+
+def test_iter_all(models, items):
+    items.add_many([models.Item(name=str(i)) for i in range(5)])
+    assert [item.name for item in items.iter_all(batch_size=2)] == [str(i) for i in range(5)]
+
+
+def test_iter_all_accepts_a_positional_session(db, models, items):
+    items.add_one(models.Item(name="a"))
+    with db.get_database_session() as session:
+        assert [item.name for item in items.iter_all(session)] == ["a"]
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_iter_all_rejects_non_positive_batch_size(items, batch_size):
+    with pytest.raises(ValueError):
+        items.iter_all(batch_size=batch_size)
+
+
+def test_add_many_returns_objects_in_order(models, items):
+    names = [f"item-{i}" for i in range(5)]
+    saved = items.add_many([models.Item(name=name) for name in reversed(names)], with_return=True)
+    assert [item.name for item in saved] == list(reversed(names))
+
+
+def test_delete_one_runs_once(db, models, items, statements):
+    item = persist(db, models.Item(name="a"))
+    statements.clear()
+    items.delete_one(item.id)
+    assert [statement.split()[0] for statement in statements] == ["DELETE"]
+    assert stored_names(db, models.Item) == []
+
+
+def test_delete_one_missing_raises_without_session(items):
+    with pytest.raises(SqlAlchemyRepositoryQueryingException):
+        items.delete_one(1)
+
+
+def test_retrieve_in_unit_of_work_uses_identity_map(db, models, items, statements):
+    item = persist(db, models.Item(name="a"))
+    with db.unit_of_work():
+        statements.clear()
+        first = items.retrieve(item.id)
+        assert items.retrieve(item.id) is first
+        assert len([statement for statement in statements if statement.startswith("SELECT")]) == 1
+
+
+def test_list_all(db, models, items):
+    items.add_many([models.Item(name="a"), models.Item(name="b")])
+    assert sorted(item.name for item in items.list_all()) == ["a", "b"]
+    with db.get_database_session() as session:
+        assert sorted(item.name for item in items.list_all(session)) == ["a", "b"]
+
+
+def test_add_one_commits_managed_session(db, models, items):
+    item = items.add_one(models.Item(name="a"))
+    assert item.id is not None
+    assert stored_names(db, models.Item) == ["a"]
+
+
+def test_add_one_only_flushes_supplied_session(db, models, items):
+    with db.get_database_session() as session:
+        item = items.add_one(models.Item(name="a"), session)
+        assert item.id is not None
+        session.rollback()
+
+    assert stored_names(db, models.Item) == []
+
+
+def test_add_many_only_flushes_supplied_session(db, models, items):
+    with db.get_database_session() as session:
+        items.add_many([models.Item(name="a")], session=session)
+        session.rollback()
+
+    assert stored_names(db, models.Item) == []
+
+
+def test_update_one_only_flushes_supplied_session(db, models, items):
+    item = items.add_one(models.Item(name="a"))
+    with db.get_database_session() as session:
+        items.update_one(item.id, {"name": "b"}, session=session)
+        session.rollback()
+
+    assert stored_names(db, models.Item) == ["a"]
+
+
+def test_delete_one_only_flushes_supplied_session(db, models, items):
+    item = items.add_one(models.Item(name="a"))
+    with db.get_database_session() as session:
+        items.delete_one(item.id, session)
+        session.rollback()
+
+    assert stored_names(db, models.Item) == ["a"]
+
+
+def test_retrieve_row(models, items):
+    item = items.add_one(models.Item(name="a"))
+    assert items.retrieve_row(item.id).name == "a"
+    assert items.retrieve_row(item.id, as_mapping=True)["name"] == "a"
+
+
+def test_retrieve_row_missing_raises(items):
+    with pytest.raises(SqlAlchemyRepositoryQueryingException):
+        items.retrieve_row(1)
+
+
+def test_list_all_rows(models, items):
+    items.add_many([models.Item(name="a"), models.Item(name="b")])
+    assert [row.name for row in items.list_all_rows()] == ["a", "b"]
+    assert [row["name"] for row in items.list_all_rows(as_mapping=True)] == ["a", "b"]
+
+
+def test_row_methods_accept_a_positional_session(db, models, items):
+    item = items.add_one(models.Item(name="a"))
+    with db.get_database_session() as session:
+        assert items.retrieve_row(item.id, session).name == "a"
+        assert [row.name for row in items.list_all_rows(session)] == ["a"]
+
+
+def test_add_one_skips_refresh(models, items, statements):
+    items.add_one(models.Item(name="a"))
+    assert not [statement for statement in statements if statement.startswith("SELECT")]
+
+
+def test_update_one_uses_a_single_statement(models, items, statements):
+    item = items.add_one(models.Item(name="a"))
+    statements.clear()
+    assert items.update_one(item.id, {"name": "b"}).name == "b"
+    assert [statement.split()[0] for statement in statements] == ["UPDATE"]
+
+
+def test_add_many_returns_loaded_objects(models, items, statements):
+    saved = items.add_many([models.Item(name="a"), models.Item(name="b")], with_return=True)
+    assert [item.name for item in saved] == ["a", "b"]
+    assert not [statement for statement in statements if statement.startswith("SELECT")]
+
+
+def test_add_many_in_batches(db, models, items, statements):
+    names = [str(i) for i in range(5)]
+    items.add_many([models.Item(name=name) for name in names], batch_size=2)
+    assert stored_names(db, models.Item) == names
+    assert len([statement for statement in statements if statement.startswith("INSERT")]) == 3
+
+
+def test_add_many_keeps_relationship_foreign_keys(db, models, children):
+    parent = models.Parent(name="p")
+    children.add_many([models.Child(parent=parent)])
+    with db.get_database_session() as session:
+        child = session.query(models.Child).one()
+        assert child.parent_id is not None
+        assert child.parent.name == "p"
+
+
+def test_update_one_session_is_positional(db, models, items):
+    item = items.add_one(models.Item(name="a"))
+    with db.get_database_session() as session:
+        items.update_one(item.id, {"name": "b"}, session)
+        session.rollback()
+
+    assert stored_names(db, models.Item) == ["a"]
+
+
+def test_add_many_without_returning_support(db, models, items, monkeypatch):
+    monkeypatch.setattr(db._engine.dialect, "insert_returning", False)
+    monkeypatch.setattr(db._engine.dialect, "insert_executemany_returning", False)
+    saved = items.add_many([models.Item(name="a"), models.Item(name="b")], with_return=True)
+    assert [item.name for item in saved] == ["a", "b"]
+    assert stored_names(db, models.Item) == ["a", "b"]
+
+
+def test_update_one_without_returning_support(db, models, items, monkeypatch):
+    item = items.add_one(models.Item(name="a"))
+    monkeypatch.setattr(db._engine.dialect, "update_returning", False)
+    assert items.update_one(item.id, {"name": "b"}).name == "b"
+    assert stored_names(db, models.Item) == ["b"]
+
+
+@pytest.mark.parametrize("with_pk", [False, True])
+def test_update_one_without_values(models, items, statements, with_pk):
+    item = items.add_one(models.Item(name="a"))
+    update_values = {"id": item.id} if with_pk else {}
+    statements.clear()
+    assert items.update_one(item.id, dict(update_values)).name == "a"
+    assert items.update_one(item.id, dict(update_values), with_return=False) is None
+    assert not [statement for statement in statements if statement.startswith("UPDATE")]
+
+
+@pytest.mark.parametrize("with_return", [False, True])
+def test_update_one_without_values_missing_raises(items, with_return):
+    with pytest.raises(SqlAlchemyRepositoryQueryingException):
+        items.update_one(1, {}, with_return=with_return)
+
+
+def test_add_many_session_is_positional(db, models, items):
+    with db.get_database_session() as session:
+        saved = items.add_many([models.Item(name="a")], True, session)
+        assert saved[0] in session
+        session.commit()
+
+    assert stored_names(db, models.Item) == ["a"]
+
+
+@pytest.mark.parametrize("batch_size", [0, -1])
+def test_add_many_rejects_non_positive_batch_size(models, items, batch_size):
+    with pytest.raises(ValueError):
+        items.add_many([models.Item(name="a")], batch_size=batch_size)
+
+
+@pytest.mark.parametrize("with_return", [False, True])
+def test_add_many_accepts_generators(db, models, items, with_return):
+    saved = items.add_many((models.Item(name=f"g{i}") for i in range(3)), with_return=with_return)
+    assert stored_names(db, models.Item) == ["g0", "g1", "g2"]
+    if with_return:
+        assert [item.name for item in saved] == ["g0", "g1", "g2"]